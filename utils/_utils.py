@@ -212,7 +212,10 @@ def project_metric(df, metric, past_n_years, first_n_years, second_n_years, firs
 
 
 def ytm(coupon_rate, face_value, present_value, maturity_date: str):
-    maturity_date = dt.datetime.strptime(maturity_date, "%Y-%m-%d")
+    # slice the ISO date directly - strptime re-parses the format string on
+    # every call
+    maturity_date = dt.datetime(int(maturity_date[0:4]), int(
+        maturity_date[5:7]), int(maturity_date[8:10]))
     n_compounding_periods = math.trunc(
         (maturity_date - dt.datetime.today()).days/365)
     num = coupon_rate + ((face_value - present_value)/n_compounding_periods)
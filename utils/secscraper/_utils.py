@@ -1,3 +1,8 @@
+# Built-in imports
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 # Third-party imports
 import pandas as pd
 import numpy as np
@@ -5,12 +10,197 @@ import datetime as dt
 import streamlit as st
 
 # Internal imports
-from utils.secscraper.sec_class import TickerData
+from utils.secscraper.sec_class import TickerData, XBRL_INSTANCE_STRAINER
+
+# segment cleanup patterns, compiled once: namespace prefix up to the first
+# ':' and the capitals that start each camel-case word
+_SEGMENT_PREFIX_RE = re.compile(r'^[^:]+:')
+_CAMEL_CASE_RE = re.compile(r'([A-Z])')
+
+# first two '_'-separated tokens of a label id, minus the 'lab_' prefix -
+# e.g. 'lab_us-gaap_Revenues_..._en-US' captures 'us-gaap_Revenues'
+_LABEL_KEY_RE = re.compile(r'^(?:lab_)?([^_]+_[^_]+)')
+
+# filings this old predate the SEC's XBRL mandate and have nothing to scrape;
+# amended filings are distinct EDGAR form values with the same XBRL
+# attachments as the originals
+_XBRL_CUTOFF_DATE = dt.datetime(2009, 1, 1)
+_XBRL_FORMS = {'10-Q', '10-K', '10-Q/A', '10-K/A'}
+
+_MONTHS_ENDED = {3: "Three Months Ended", 6: "Six Months Ended",
+                 9: "Nine Months Ended", 12: "Twelve Months Ended"}
 
 
-def get_filing_facts(ticker: TickerData, filings_to_scrape: list, verbose=False):
+def _concat_frames(frames: list, columns: list = None, category_columns: tuple = ()) -> pd.DataFrame:
+    """Concatenate a list of per-filing DataFrames in one call.
+
+    Args:
+        frames (list): list of DataFrames collected over the filing loop
+        columns (list, optional): columns for the empty frame when nothing
+            was scraped
+        category_columns (tuple, optional): heavily repeated string columns
+            (accessionNumber, xlink:role, ...) to store as category after
+            the concat - one code per distinct value instead of one Python
+            string pointer per row
+
+    Returns:
+        pd.DataFrame: concatenated frame, or an empty one if the list is empty
     """
-    Scrape facts, context, labels, definitions, calculations, metalinks from filings_to_scrape
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    df = pd.concat(frames, ignore_index=True)
+    # cast after concatenating: per-filing categoricals carry different
+    # category sets, which pd.concat would decay back to object anyway
+    for col in category_columns:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _scrape_filing(ticker: TickerData, file: dict):
+    """Scrape facts, context, labels, definitions, calculations and metalinks
+    for a single filing. Runs on a worker thread from get_filing_facts.
+
+    ### Parameters
+    ----------
+    ticker : TickerData
+        TickerData object
+    file : dict
+        filing dict to scrape
+
+    ### Returns
+    -------
+    frames : dict
+        per-source DataFrame keyed by metalinks/facts/context/labels/calc/
+        defn/merged_facts, None where scraping failed
+    failed : list
+        failure records for this filing
+    """
+    frames = {'metalinks': None, 'facts': None, 'context': None,
+              'labels': None, 'calc': None, 'defn': None, 'merged_facts': None}
+    failed = []
+    facts = context = labels = None
+
+    # skip before any network I/O: XBRL instance/linkbase attachments only
+    # exist on 10-Q/10-K filings from the 2009 mandate onwards
+    filing_date = file.get('filingDate')
+    if file.get('form') not in _XBRL_FORMS or filing_date < _XBRL_CUTOFF_DATE:
+        return frames, failed
+
+    accessionNumber = file.get('accessionNumber')
+    folder_url = file.get('folder_url')
+    file_url = file.get('file_url')
+    ticker.scrape_logger.info(
+        filing_date.strftime('%Y-%m-%d') + ': ' + folder_url)
+
+    soup = ticker.get_file_data(
+        file_url=file_url, parse_only=XBRL_INSTANCE_STRAINER)
+
+    # Scrape facts, context, metalinks
+    try:
+        metalinks = ticker.get_metalinks(
+            metalinks_url=folder_url + '/MetaLinks.json')
+        metalinks['accessionNumber'] = accessionNumber
+        frames['metalinks'] = metalinks
+    except Exception as e:
+        ticker.scrape_logger.error(
+            f'Failed to scrape metalinks for {folder_url}...{e}')
+        failed.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
+                           error=f'Failed to scrape metalinks for {folder_url}...{e}', filingDate=filing_date))
+
+    try:
+        facts = ticker.search_facts(soup=soup)
+        facts['accessionNumber'] = accessionNumber
+        frames['facts'] = facts
+    except Exception as e:
+        ticker.scrape_logger.error(
+            f'Failed to scrape facts for {folder_url}...{e}')
+        failed.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
+                           error=f'Failed to scrape facts for {folder_url}...{e}', filingDate=filing_date))
+    try:
+        context = ticker.search_context(soup=soup)
+        context['accessionNumber'] = accessionNumber
+        frames['context'] = context
+    except Exception as e:
+        ticker.scrape_logger.error(
+            f'Failed to scrape context for {folder_url}...{e}')
+        failed.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
+                           error=f'Failed to scrape context for {folder_url}...{e}', filingDate=filing_date))
+
+    index_df = ticker.get_filing_folder_index(folder_url=folder_url)
+
+    try:  # Scrape labels
+        labels = ticker.get_elements(folder_url=folder_url, index_df=index_df,
+                                     scrape_file_extension='_lab', xlink_type='resource')
+        labels['xlink:role'] = labels['xlink:role'].str.rsplit(
+            '/', n=1).str[-1]
+        labels['xlink:label'] = labels['xlink:label'].str\
+            .extract(_LABEL_KEY_RE, expand=False).str\
+            .replace('_', ':', regex=False)\
+            .str.lower()
+        labels['accessionNumber'] = accessionNumber
+        frames['labels'] = labels
+
+    except Exception as e:
+        ticker.scrape_logger.error(
+            f'Failed to scrape labels for {folder_url}...{e}')
+        failed.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
+                           error=f'Failed to scrape labels for {folder_url}...{e}', filingDate=filing_date))
+
+    try:  # Scrape calculations
+        calc = ticker.get_elements(folder_url=folder_url, index_df=index_df,
+                                   scrape_file_extension='_cal', xlink_type='arc')
+        calc['accessionNumber'] = accessionNumber
+        frames['calc'] = calc
+    except Exception as e:
+        ticker.scrape_logger.error(
+            f'Failed to scrape calc for {folder_url}...{e}')
+        failed.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
+                           error=f'Failed to scrape calc for {folder_url}...{e}', filingDate=filing_date))
+
+    try:  # Scrape definitions
+        defn = ticker.get_elements(folder_url=folder_url, index_df=index_df,
+                                   scrape_file_extension='_def', xlink_type='arc')
+        defn['accessionNumber'] = accessionNumber
+        frames['defn'] = defn
+    except Exception as e:
+        ticker.scrape_logger.error(
+            f'Failed to scrape defn for {folder_url}...{e}')
+        failed.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
+                           error=f'Failed to scrape defn for {folder_url}...{e}', filingDate=filing_date))
+
+    if facts is None or len(facts) == 0:
+        ticker.scrape_logger.info(
+            f'No facts found for {ticker.ticker}({ticker.cik})-{folder_url}...\n')
+        return frames, failed
+
+    ticker.scrape_logger.info(
+        f'Merging facts with context and labels. Current facts length: {len(facts)}...')
+    try:
+        merged_facts = facts.merge(context, how='left', left_on='contextRef', right_on='contextId')\
+            .merge(labels.query("`xlink:role` == 'label'"), how='left', left_on='factName', right_on='xlink:label')
+        merged_facts = merged_facts.drop(
+            ['accessionNumber_x', 'accessionNumber_y'], axis=1)
+        frames['merged_facts'] = merged_facts
+        ticker.scrape_logger.info(
+            f'Successfully merged facts with context and labels. Merged facts length: {len(merged_facts)}...')
+    except Exception as e:
+        ticker.scrape_logger.error(
+            f'Failed to merge facts with context and labels for {folder_url}...{e}')
+        failed.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
+                           error=f'Failed to merge facts with context and labels for {folder_url}...{e}', filingDate=filing_date))
+
+    ticker.scrape_logger.info(
+        f'Successfully scraped {ticker.ticker}({ticker.cik})-{folder_url}...\n')
+    return frames, failed
+
+
+def get_filing_facts(ticker: TickerData, filings_to_scrape: list, verbose=False, max_workers: int = 8):
+    """
+    Scrape facts, context, labels, definitions, calculations, metalinks from filings_to_scrape.
+    Filings are scraped concurrently on a thread pool - the work is almost
+    entirely network I/O and rate_limited_request keeps the pool within the
+    SEC request budget.
 
     ### Parameters
     ----------
@@ -18,6 +208,8 @@ def get_filing_facts(ticker: TickerData, filings_to_scrape: list, verbose=False)
         TickerData object
     filings_to_scrape : list
         list of filings dict to scrape
+    max_workers : int
+        number of scraping threads
 
     ### Returns
     -------
@@ -38,146 +230,65 @@ def get_filing_facts(ticker: TickerData, filings_to_scrape: list, verbose=False)
     failed_folders : list
         list of failed folders
     """
-    all_labels = pd.DataFrame()
-    all_calc = pd.DataFrame()
-    all_defn = pd.DataFrame()
-    all_context = pd.DataFrame()
-    all_facts = pd.DataFrame()
-    all_metalinks = pd.DataFrame()
-    all_merged_facts = pd.DataFrame()
+    # collect per-filing frames in lists and concat once at the end -
+    # concatenating inside the loop recopies all previous rows per filing
+    all_labels = []
+    all_calc = []
+    all_defn = []
+    all_context = []
+    all_facts = []
+    all_metalinks = []
+    all_merged_facts = []
     failed_folders = []
 
-    for file in filings_to_scrape:
-        if (file.get('form') != '10-Q' or file.get('form') != '10-K') and file.get('filingDate') < dt.datetime(2009, 1, 1):
-            continue
-
-        accessionNumber = file.get('accessionNumber')
-        folder_url = file.get('folder_url')
-        file_url = file.get('file_url')
-        ticker.scrape_logger.info(
-            file.get('filingDate').strftime('%Y-%m-%d') + ': ' + folder_url)
-
-        soup = ticker.get_file_data(file_url=file_url)
-
-        # Scrape facts, context, metalinks
-        try:
-            metalinks = ticker.get_metalinks(
-                folder_url=folder_url + '/MetaLinks.json')
-            metalinks['accessionNumber'] = accessionNumber
-            all_metalinks = pd.concat(
-                [all_metalinks, metalinks], ignore_index=True)
-        except Exception as e:
-            ticker.scrape_logger.error(
-                f'Failed to scrape metalinks for {folder_url}...{e}')
-            failed_folders.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
-                                  error=f'Failed to scrape metalinks for {folder_url}...{e}', filingDate=file.get('filingDate')))
-            pass
-
-        try:
-            facts = ticker.search_facts(soup=soup)
-            facts['accessionNumber'] = accessionNumber
-            all_facts = pd.concat([all_facts, facts], ignore_index=True)
-        except Exception as e:
-            ticker.scrape_logger.error(
-                f'Failed to scrape facts for {folder_url}...{e}')
-            failed_folders.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
-                                  error=f'Failed to scrape facts for {folder_url}...{e}', filingDate=file.get('filingDate')))
-            pass
-        try:
-            context = ticker.search_context(soup=soup)
-            context['accessionNumber'] = accessionNumber
-            all_context = pd.concat([all_context, context], ignore_index=True)
-        except Exception as e:
-            ticker.scrape_logger.error(
-                f'Failed to scrape context for {folder_url}...{e}')
-            failed_folders.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
-                                  error=f'Failed to scrape context for {folder_url}...{e}', filingDate=file.get('filingDate')))
-            pass
-
-        index_df = ticker.get_filing_folder_index(folder_url=folder_url)
-
-        try:  # Scrape labels
-            labels = ticker.get_elements(folder_url=folder_url, index_df=index_df,
-                                         scrape_file_extension='_lab').query("`xlink:type` == 'resource'")
-            labels['xlink:role'] = labels['xlink:role'].str.split(
-                '/').apply(lambda x: x[-1])
-            labels['xlink:label'] = labels['xlink:label'].str\
-                .replace('(lab_)|(_en-US)', '', regex=True).str\
-                .split('_')\
-                .apply(lambda x: ':'.join(x[:2]))\
-                .str.lower()
-            labels['accessionNumber'] = accessionNumber
-            all_labels = pd.concat([all_labels, labels], ignore_index=True)
-
-        except Exception as e:
-            ticker.scrape_logger.error(
-                f'Failed to scrape labels for {folder_url}...{e}')
-            failed_folders.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
-                                  error=f'Failed to scrape labels for {folder_url}...{e}', filingDate=file.get('filingDate')))
-            pass
-
-        try:  # Scrape calculations
-            calc = ticker.get_elements(folder_url=folder_url, index_df=index_df,
-                                       scrape_file_extension='_cal').query("`xlink:type` == 'arc'")
-            calc['accessionNumber'] = accessionNumber
-            all_calc = pd.concat([all_calc, calc], ignore_index=True)
-        except Exception as e:
-            ticker.scrape_logger.error(
-                f'Failed to scrape calc for {folder_url}...{e}')
-            failed_folders.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
-                                  error=f'Failed to scrape calc for {folder_url}...{e}', filingDate=file.get('filingDate')))
-            pass
-
-        try:  # Scrape definitions
-            defn = ticker.get_elements(folder_url=folder_url, index_df=index_df,
-                                       scrape_file_extension='_def').query("`xlink:type` == 'arc'")
-            defn['accessionNumber'] = accessionNumber
-            all_defn = pd.concat([all_defn, defn], ignore_index=True)
-        except Exception as e:
-            ticker.scrape_logger.error(
-                f'Failed to scrape defn for {folder_url}...{e}')
-            failed_folders.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
-                                  error=f'Failed to scrape defn for {folder_url}...{e}', filingDate=file.get('filingDate')))
-            pass
-
-        if len(facts) == 0:
-            ticker.scrape_logger.info(
-                f'No facts found for {ticker.ticker}({ticker.cik})-{folder_url}...\n')
-            continue
-
-        ticker.scrape_logger.info(
-            f'Merging facts with context and labels. Current facts length: {len(facts)}...')
-        try:
-            merged_facts = facts.merge(context, how='left', left_on='contextRef', right_on='contextId')\
-                .merge(labels.query("`xlink:role` == 'label'"), how='left', left_on='factName', right_on='xlink:label')
-            merged_facts = merged_facts.drop(
-                ['accessionNumber_x', 'accessionNumber_y'], axis=1)
-            ticker.scrape_logger.info(
-                f'Successfully merged facts with context and labels. Merged facts length: {len(merged_facts)}...')
-        except Exception as e:
-            ticker.scrape_logger.error(
-                f'Failed to merge facts with context and labels for {folder_url}...{e}')
-            failed_folders.append(dict(folder_url=folder_url, accessionNumber=accessionNumber,
-                                  error=f'Failed to merge facts with context and labels for {folder_url}...{e}', filingDate=file.get('filingDate')))
-            pass
-
-        all_merged_facts = pd.concat(
-            [all_merged_facts, merged_facts], ignore_index=True)
-        ticker.scrape_logger.info(
-            f'Successfully scraped {ticker.ticker}({ticker.cik})-{folder_url}...\n')
-        if verbose:
-            st.success(
-                ticker.ticker + ' ' + file.get('filingDate').strftime('%Y-%m-%d'))
-    all_merged_facts = all_merged_facts.loc[~all_merged_facts['labelText'].isnull(), [
-        'labelText', 'segment', 'startDate', 'endDate', 'instant', 'value', 'unitRef']]
+    accumulators = {'labels': all_labels, 'calc': all_calc, 'defn': all_defn,
+                    'context': all_context, 'facts': all_facts,
+                    'metalinks': all_metalinks, 'merged_facts': all_merged_facts}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            partial(_scrape_filing, ticker), filings_to_scrape)
+        # executor.map yields in submission order, so results stay aligned
+        # with filings_to_scrape; streamlit calls stay on the main thread
+        for file, (frames, failed) in zip(filings_to_scrape, results):
+            failed_folders.extend(failed)
+            for key, accumulator in accumulators.items():
+                if frames[key] is not None:
+                    accumulator.append(frames[key])
+            if verbose and frames['merged_facts'] is not None:
+                st.success(
+                    ticker.ticker + ' ' + file.get('filingDate').strftime('%Y-%m-%d'))
+
+    all_labels = _concat_frames(
+        all_labels, category_columns=('accessionNumber', 'xlink:role', 'xlink:type'))
+    all_calc = _concat_frames(
+        all_calc, category_columns=('accessionNumber', 'xlink:role', 'xlink:type'))
+    all_defn = _concat_frames(
+        all_defn, category_columns=('accessionNumber', 'xlink:role', 'xlink:type'))
+    all_context = _concat_frames(
+        all_context, category_columns=('accessionNumber',))
+    all_facts = _concat_frames(
+        all_facts, category_columns=('accessionNumber', 'unitRef'))
+    all_metalinks = _concat_frames(
+        all_metalinks, category_columns=('accessionNumber',))
+    merged_columns = ['labelText', 'segment', 'startDate',
+                      'endDate', 'instant', 'value', 'unitRef']
+    all_merged_facts = _concat_frames(all_merged_facts, columns=merged_columns)
+    # project down to the output columns first so the unlabelled-row drop
+    # only copies the seven columns that survive
+    all_merged_facts = all_merged_facts[merged_columns].dropna(
+        subset=['labelText'])
 
     return all_labels, all_calc, all_defn, all_context, all_facts, all_metalinks, all_merged_facts, failed_folders
 
 
 def clean_values_in_facts(merged_facts: pd.DataFrame):
-    df = merged_facts.loc[(~merged_facts['value'].str.contains(
-        '[^0-9\.\-]|(^\d+\-\d+\-\d+$)')) & (merged_facts['value'] != "")].copy()
-    df['value'] = df['value'].astype(float)
+    # to_numeric parses and filters in one C pass: dates, empty strings and
+    # anything else non-numeric coerce to NaN and are dropped, replacing the
+    # old regex reject + astype(float) double scan
+    values = pd.to_numeric(merged_facts['value'], errors='coerce')
+    df = merged_facts.loc[values.notna()].copy()
+    df['value'] = values[values.notna()].to_numpy()
 
     return df
 
@@ -191,14 +302,12 @@ def clean_values_in_segment(merged_facts: pd.DataFrame) -> pd.DataFrame:
     Returns:
         merged_facts (pd.DataFrame): merged facts data frame with segment column cleaned
     """
-    prepends = [i[0] for i in merged_facts.loc[(merged_facts['segment'].str.contains(':')) & (
-        ~merged_facts['segment'].isna())]['segment'].str.extract(r'(.*:)').drop_duplicates().values]
-    pattern = '|'.join(prepends)
-
+    # strip whatever namespace prefix is present and space out the camel
+    # case in two vectorized passes - no need to first extract the distinct
+    # prefixes and build an alternation pattern out of them
     merged_facts['segment'] = merged_facts['segment']\
-        .str.replace(pat=pattern, repl='', regex=True)\
-        .str.replace(pat=r'([A-Z])', repl=r' \1', regex=True).str.strip()
-    # .apply(lambda x: x[-1] if isinstance(x, list) else x)\
+        .str.replace(pat=_SEGMENT_PREFIX_RE, repl='', regex=True)\
+        .str.replace(pat=_CAMEL_CASE_RE, repl=r' \1', regex=True).str.strip()
 
     return merged_facts
 
@@ -225,21 +334,17 @@ def split_facts_into_start_instant(merged_facts: pd.DataFrame):
     return merged_facts, start_end, instant
 
 def get_monthly_period(df: pd.DataFrame) -> pd.DataFrame:
-    df['period'] = pd.to_timedelta(df['endDate'] - df['startDate']).dt.days / 30.25
-    df['period'] = df['period'].round(0)
-    df['Months Ended'] = np.select(
-        [
-            df['period'] == 3,
-            df['period'] == 6,
-            df['period'] == 9,
-            df['period'] == 12,
-        ],
-        [
-            "Three Months Ended",
-            "Six Months Ended",
-            "Nine Months Ended",
-            "Twelve Months Ended",
-        ],
-        default=None
-    )
+    # endDate - startDate is already a timedelta series, no pd.to_timedelta
+    # re-wrap needed. round(days / 30.25) == (8*days + 121) // 242 in pure
+    # integer arithmetic (never lands exactly on .5), skipping the float
+    # divide + round pass
+    days = (df['endDate'] - df['startDate']).dt.days
+    df['period'] = (8 * days + 121) // 242
+    # a direct lookup over the four valid periods, rather than np.select
+    # which evaluates and stacks a boolean mask per choice before picking
+    months = df['period'].to_numpy()
+    months_ended = np.full(len(df), None, dtype=object)
+    for period, label in _MONTHS_ENDED.items():
+        months_ended[months == period] = label
+    df['Months Ended'] = months_ended
     return df
\ No newline at end of file
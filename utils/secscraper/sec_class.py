@@ -1,17 +1,42 @@
 import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import pandas as pd
 import json
 import xml.etree.ElementTree as ET
+from functools import cached_property
 from ratelimit import limits, sleep_and_retry
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from tqdm import trange
 import re
 from utils._logger import MyLogger
 
+# compiled once at import - these patterns run for every tag of every
+# filing scraped
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+_FACT_TAG_RE = re.compile(r'^us-gaap:')
+
+# keep only the subtrees the search_* methods actually read when parsing a
+# .txt instance document - most of the document is markup we never touch
+XBRL_INSTANCE_STRAINER = SoupStrainer(
+    re.compile(r'^(?:context$|link:label$|us-gaap:)'))
+
+
+# deletes every ASCII character that is not a letter or digit - MetaLinks
+# keys are plain ASCII, so one table lookup per character replaces a run
+# of the regex engine per key
+_NON_ALNUM_TABLE = str.maketrans(
+    '', '', ''.join(chr(c) for c in range(128) if not chr(c).isalnum()))
+
 
 def convert_keys_to_lowercase(d):
-    """Recursively convert all keys in a dictionary to lowercase.
+    """Convert all keys in a (nested) dictionary to lowercase alphanumerics.
+
+    Walks the nesting with an explicit stack instead of recursing - deep
+    MetaLinks responses otherwise pay a Python frame per level.
 
     Args:
         d (dict): Dictionary to convert
@@ -20,11 +45,16 @@ def convert_keys_to_lowercase(d):
         dict: Dictionary with all keys converted to lowercase
     """
     new_dict = {}
-    for k, v in d.items():
-        if isinstance(v, dict):
-            v = convert_keys_to_lowercase(v)
-        new_key = re.sub(r'[^a-zA-Z0-9]', '', k.lower())
-        new_dict[new_key] = v
+    stack = [(d, new_dict)]
+    while stack:
+        src, dst = stack.pop()
+        for k, v in src.items():
+            new_key = k.lower().translate(_NON_ALNUM_TABLE)
+            if isinstance(v, dict):
+                dst[new_key] = child = {}
+                stack.append((v, child))
+            else:
+                dst[new_key] = v
     return new_dict
 
 
@@ -85,6 +115,8 @@ class SECData(MyLogger):
 
     SCRAPE_FILE_EXTENSIONS = {'_lab', '_def', '_pre', '_cal'}
 
+    CACHE_DIR = 'data/cache'
+
     def __init__(self, requester_company: str = 'Financial API', requester_name: str = 'API Caller', requester_email: str = 'apicaller@gmail.com', taxonomy: str = 'us-gaap',):
         super().__init__(name='sec-scraper', level='debug', log_file='././logs.log')
 
@@ -97,44 +129,109 @@ class SECData(MyLogger):
         self.sec_data_headers = {"User-Agent": f"{requester_company} {requester_name} {requester_email}",
                                  "Accept-Encoding": "gzip, deflate",
                                  "Host": "data.sec.gov"}
-        self._cik_list = None
-        self._tags = None
+        self._session = requests.Session()
+        # size the keep-alive pool for concurrent scraping threads so
+        # sockets to www.sec.gov/data.sec.gov are reused instead of being
+        # discarded when more than the default ten are in flight
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=32)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
         if taxonomy not in self.ALLOWED_TAXONOMIES:
             raise ValueError(
                 f"Taxonomy {taxonomy} is not supported. Please use one of the following taxonomies: {self.ALLOWED_TAXONOMIES}")
         self.taxonomy = taxonomy
 
-    @property
+    # shared across instances - every TickerData otherwise revalidates and
+    # re-parses the same multi-MB company_tickers.json per construction
+    _shared_cik_list = None
+
+    @cached_property
     def cik_list(self,):
-        if self._cik_list is None:
-            self._cik_list = self.get_cik_list()
-        return self._cik_list
+        if SECData._shared_cik_list is None:
+            SECData._shared_cik_list = self.get_cik_list()
+        return SECData._shared_cik_list
 
-    @property
+    @cached_property
+    def ticker_cik_map(self,) -> dict:
+        return {ticker: f"{cik_str:010d}" for ticker, cik_str in zip(
+            self.cik_list['ticker'], self.cik_list['cik_str'])}
+
+    @cached_property
     def tags(self,):
-        if self._tags is None:
-            self._tags = self.get_usgaap_tags()
-        return self._tags
+        return self.get_usgaap_tags()
 
     @sleep_and_retry
     @limits(calls=10, period=1)
-    def rate_limited_request(self, url: str, headers: dict):
+    def rate_limited_request(self, url: str, headers: dict, max_retries: int = 3):
         """Rate limited request to SEC Edgar database.
+        Honours the Retry-After header when SEC responds with 429, any other
+        4xx is returned immediately since retrying a bad request only burns
+        the rate limit budget.
 
         Args:
             url (str): URL to retrieve data from
             headers (dict): Headers to be used for API calls
+            max_retries (int): Maximum number of attempts on 429 responses
 
         Returns:
             response: Response from API call
         """
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
+        for _ in range(max_retries):
+            response = self._session.get(url, headers=headers)
+            if response.status_code != 429:
+                break
+            retry_after = float(response.headers.get('Retry-After', 2))
+            self.scrape_logger.warning(
+                f'''Rate limited at URL: {url}. Retrying in {retry_after}s...''')
+            time.sleep(retry_after)
+        # 304 is the designed happy path for request_with_cache's ETag
+        # revalidation, not a failure
+        if response.status_code not in (200, 304):
             self.scrape_logger.error(f'''Request failed at URL: {url}''')
         else:
             self.scrape_logger.info(f'''Request successful at URL: {url}''')
         return response
 
+    def request_with_cache(self, url: str, headers: dict, cache_name: str) -> bytes:
+        """Request a URL, revalidating a local on-disk copy with its saved ETag.
+        Rarely-changing files (company_tickers.json, taxonomy .xsd) are stored
+        under CACHE_DIR next to their ETag. Subsequent calls send
+        If-None-Match and a 304 answer serves the cached bytes without
+        re-downloading the body.
+
+        Args:
+            url (str): URL to retrieve data from
+            headers (dict): Headers to be used for API calls
+            cache_name (str): file name for the cached copy
+
+        Returns:
+            bytes: response body
+        """
+        os.makedirs(self.CACHE_DIR, exist_ok=True)
+        cache_path = os.path.join(self.CACHE_DIR, cache_name)
+        etag_path = cache_path + '.etag'
+
+        if os.path.exists(cache_path) and os.path.exists(etag_path):
+            with open(etag_path) as f:
+                etag = f.read().strip()
+            response = self.rate_limited_request(
+                url, headers={**headers, 'If-None-Match': etag})
+            if response.status_code == 304:
+                self.scrape_logger.info(f'''Cache hit for URL: {url}''')
+                with open(cache_path, 'rb') as f:
+                    return f.read()
+        else:
+            response = self.rate_limited_request(url, headers=headers)
+
+        if response.status_code == 200:
+            with open(cache_path, 'wb') as f:
+                f.write(response.content)
+            if response.headers.get('ETag'):
+                with open(etag_path, 'w') as f:
+                    f.write(response.headers['ETag'])
+        return response.content
+
     def get_cik_list(self):
         """Retrieves the full list of CIK available from SEC database.
 
@@ -145,9 +242,9 @@ class SECData(MyLogger):
             cik_df: DataFrame containing CIK and ticker
         """
         url = r"https://www.sec.gov/files/company_tickers.json"
-        cik_raw = self.rate_limited_request(url, self.sec_headers)
-        cik_json = cik_raw.json()
-        cik_df = pd.DataFrame.from_dict(cik_json).T
+        content = self.request_with_cache(
+            url, self.sec_headers, 'company_tickers.json')
+        cik_df = pd.DataFrame.from_dict(json.loads(content)).T
         return cik_df
 
     def get_ticker_cik(self, ticker: str,):
@@ -160,9 +257,10 @@ class SECData(MyLogger):
         Returns:
             cik: CIK number of the company excluding the leading 'CIK'
         """
-        ticker_cik = self.cik_list.query(
-            f"ticker == '{ticker.upper()}'")['cik_str']
-        cik = f"{ticker_cik.iloc[0]:010d}"
+        cik = self.ticker_cik_map.get(ticker.upper())
+        if cik is None:
+            raise ValueError(
+                f"Ticker {ticker.upper()} is not in the SEC CIK list.")
         return cik
 
     def get_usgaap_tags(self, xsd_url: str = US_GAAP_TAXONOMY_URL):
@@ -171,9 +269,9 @@ class SECData(MyLogger):
         Returns:
             list of tags
         """
-        response = self.rate_limited_request(xsd_url, headers=self.sec_headers)
-        xsd_content = response.text
-        root = ET.fromstring(xsd_content)
+        content = self.request_with_cache(
+            xsd_url, headers=self.sec_headers, cache_name=xsd_url.rsplit('/', 1)[-1])
+        root = ET.fromstring(content)
 
         return [element.attrib['name'] for element in root.findall(".//{http://www.w3.org/2001/XMLSchema}element")]
 
@@ -190,7 +288,7 @@ class SECData(MyLogger):
         if response.status_code != 200:
             raise Exception(
                 f"Failed to retrieve submissions. Status code: {response.status_code}")
-        data = json.loads(response.text)
+        data = response.json()
         return data
 
     def get_company_concept(self, cik: str, tag: str, taxonomy: str = 'us-gaap',):
@@ -213,7 +311,7 @@ class SECData(MyLogger):
         url = f"{self.BASE_API_URL}api/xbrl/companyconcept/CIK{cik}/{taxonomy}/{tag}.json"
         response = self.rate_limited_request(
             url, headers=self.sec_data_headers)
-        data = json.loads(response.text)
+        data = response.json()
         return data
 
     def get_company_facts(self, cik):
@@ -223,7 +321,7 @@ class SECData(MyLogger):
         if response.status_code != 200:
             raise Exception(
                 f"Failed to retrieve company facts for CIK {cik}. Status code: {response.status_code}")
-        data = json.loads(response.text)
+        data = response.json()
         return data
 
     def get_frames(self, taxonomy, tag, unit, period):
@@ -245,7 +343,7 @@ class SECData(MyLogger):
         url = f"{self.BASE_API_URL}api/xbrl/frames/{taxonomy}/{tag}/{unit}/{period}.json"
         response = self.rate_limited_request(
             url, headers=self.sec_data_headers)
-        data = json.loads(response.text)
+        data = response.json()
         return data
 
     def get_data_as_dataframe(self, cik: str,):
@@ -259,20 +357,25 @@ class SECData(MyLogger):
         """
         data = self.get_company_facts(cik)
 
-        df = pd.DataFrame()
-
-        for tag in data['facts'][self.taxonomy]:
-            facts = data['facts']['us-gaap'][tag]['units']
-            unit_key = list(facts.keys())[0]
-            temp_df = pd.DataFrame(facts[unit_key])
-            temp_df['label'] = tag
-            df = pd.concat([df, temp_df], axis=0, ignore_index=True)
+        # flatten every tag's fact rows into one records list and build the
+        # DataFrame in a single pass - one dtype inference over all rows
+        # instead of a frame construction per tag followed by a concat
+        records = []
+        for tag, tag_data in data['facts'][self.taxonomy].items():
+            units = tag_data['units']
+            unit_key = next(iter(units))
+            for row in units[unit_key]:
+                records.append({**row, 'label': tag})
+        df = pd.DataFrame(records)
         df = df.astype({'val': 'float64',
                         'end': 'datetime64[ns]',
                         'start': 'datetime64[ns]',
                         'filed': 'datetime64[ns]'})
-        df['Months Ended'] = (df['end'] - df['start']
-                              ).dt.days.div(30.4375).round(0)
+        # round(days / 30.4375) == (32*days + 487) // 974 in pure integer
+        # arithmetic (never lands exactly on .5), skipping the float divide
+        # + round pass; NaN propagates for facts without a start date
+        days = (df['end'] - df['start']).dt.days
+        df['Months Ended'] = (32 * days + 487) // 974
         return df
 
     def get_cik_index(self, cik: str = None,) -> dict:
@@ -310,18 +413,14 @@ class SECData(MyLogger):
         response = self.rate_limited_request(
             sic_list_url, headers=self.sec_headers)
 
-        soup = BeautifulSoup(response.content, "lxml")
-        sic_table = soup.find('table', {'class': 'list'})
-        sic_list = []
-        for row in sic_table.find_all('tr')[1:]:
-            sic_dict = {'_id': None,
-                        'Office': None, 'Industry Title': None}
-            sic_dict['_id'] = row.text.split('\n')[1]
-            sic_dict['Office'] = row.text.split('\n')[2]
-            sic_dict['Industry Title'] = row.text.split('\n')[3]
-            sic_list.append(sic_dict)
+        # read_html extracts the whole table in lxml C code - the old loop
+        # re-split each row's text three times per <tr> in Python
+        sic_table = pd.read_html(
+            response.content, attrs={'class': 'list'}, header=0)[0]
+        sic_table.columns = ['_id', 'Office', 'Industry Title']
+        sic_table['_id'] = sic_table['_id'].astype(str)
 
-        return sic_list
+        return sic_table.to_dict('records')
 
 
 class TickerData(SECData):
@@ -336,19 +435,33 @@ class TickerData(SECData):
         super().__init__(requester_company, requester_name, requester_email, taxonomy)
         self.ticker = ticker.upper()
         self.cik = self.get_ticker_cik(self.ticker)
+        # every filing url hangs off this prefix - build it once per ticker
+        self._company_dir_url = self.BASE_DIRECTORY_URL + self.cik + '/'
         self._submissions = self.get_submissions(self.cik)
         self._filings = None
         self._forms = None
         self._index = self.get_cik_index(self.cik)
         self._filing_folder_urls = None
         self._filing_urls = None
+        # parsed-file caches - successive filings of the same filer reuse
+        # taxonomy files, so keying on url (+ extension) skips repeat
+        # downloads and parses
+        self._elements_cache = {}
+        self._metalinks_cache = {}
 
     @property
     def submissions(self,) -> dict:
         if self._submissions is not None:
             self._submissions['cik'] = self.cik
-            self._submissions['filings'] = self.filings.replace(
-                {pd.NaT: None}).to_dict('records')
+            filings = self.filings.copy()
+            # NaT only lives in the datetime columns - no need to scan the
+            # whole frame with replace; 'datetimetz' catches the tz-aware
+            # acceptanceDateTime, which 'datetime64[ns]' would skip
+            dt_cols = filings.select_dtypes(
+                include=['datetime', 'datetimetz']).columns
+            filings[dt_cols] = filings[dt_cols].astype(object).where(
+                filings[dt_cols].notna(), None)
+            self._submissions['filings'] = filings.to_dict('records')
         return self._submissions
 
     @property
@@ -357,21 +470,27 @@ class TickerData(SECData):
             self._filings = self.get_filings()
         return self._filings
 
-    @property
-    def latest_filing(self,) -> pd.DataFrame:
+    def _latest_by_form(self, form: str) -> dict:
+        matches = self.filings.loc[self.filings['form'] == form]
+        return matches.iloc[0, :].to_dict() if len(matches) > 0 else None
+
+    # cached - the reprs read each of these several times per render, and
+    # every access used to rescan the filings frame
+    @cached_property
+    def latest_filing(self,) -> dict:
         return self.filings.iloc[0, :].to_dict() if len(self.filings) > 0 else None
 
-    @property
-    def latest_10Q(self,) -> pd.DataFrame:
-        return self.filings.query("form == '10-Q'").iloc[0, :].to_dict() if len(self.filings.query("form == '10-Q'")) > 0 else None
+    @cached_property
+    def latest_10Q(self,) -> dict:
+        return self._latest_by_form('10-Q')
 
-    @property
-    def latest_10K(self,) -> pd.DataFrame:
-        return self.filings.query("form == '10-K'").iloc[0, :].to_dict() if len(self.filings.query("form == '10-K'")) > 0 else None
+    @cached_property
+    def latest_10K(self,) -> dict:
+        return self._latest_by_form('10-K')
 
-    @property
-    def latest_8K(self,) -> pd.DataFrame:
-        return self.filings.query("form == '8-K'").iloc[0, :].to_dict() if len(self.filings.query("form == '8-K'")) > 0 else None
+    @cached_property
+    def latest_8K(self,) -> dict:
+        return self._latest_by_form('8-K')
 
     @property
     def filing_folder_urls(self,) -> list:
@@ -464,40 +583,51 @@ class TickerData(SECData):
             f'Making http request for {self.ticker} filings...')
         filings = self._submissions['filings']['recent']
 
-        if len(self._submissions['filings']) > 1:
+        # the old guard compared the size of the outer filings dict (always
+        # 'recent' plus 'files'), not whether any paged files exist; extend
+        # one accumulator per key instead of re-copying every list per page
+        if self._submissions['filings'].get('files'):
             self.scrape_logger.info(
                 f'Additional filings found for {self.ticker}...')
+            filings = {key: list(values) for key, values in filings.items()}
             for file in self._submissions['filings']['files']:
                 additional_filing = self.get_submissions(
                     submission_file=file['name'])
-                filings = {key: filings[key] + additional_filing[key]
-                           for key in filings.keys()}
+                for key, values in filings.items():
+                    values.extend(additional_filing[key])
 
         filings = pd.DataFrame(filings)
-        # Convert reportDate, filingDate, acceptanceDateTime columns to datetime
-        filings['reportDate'] = pd.to_datetime(filings['reportDate'])
-        filings['filingDate'] = pd.to_datetime(filings['filingDate'])
+        # Convert reportDate, filingDate, acceptanceDateTime columns to
+        # datetime - explicit formats skip per-value format inference and
+        # cache=True amortizes parsing across repeated dates
+        filings['reportDate'] = pd.to_datetime(
+            filings['reportDate'], format='%Y-%m-%d', errors='coerce', cache=True)
+        filings['filingDate'] = pd.to_datetime(
+            filings['filingDate'], format='%Y-%m-%d', errors='coerce', cache=True)
         filings['acceptanceDateTime'] = pd.to_datetime(
-            filings['acceptanceDateTime'])
+            filings['acceptanceDateTime'], format='ISO8601', cache=True)
         filings['cik'] = self.cik
 
         filings = filings.loc[~pd.isnull(filings['reportDate'])]
 
-        # get folder url for each row
-        filings['folder_url'] = self.BASE_DIRECTORY_URL + \
-            self.cik + '/' + filings['accessionNumber'].str.replace('-', '')
-
-        # get file url for each row
-        filings['file_url'] = filings['folder_url'] + \
-            '/' + filings['accessionNumber'] + '.txt'
+        # build folder and file urls in one pass per row - each chained
+        # pandas str op copies the whole object column
+        base_url = self._company_dir_url
+        accession_numbers = filings['accessionNumber'].tolist()
+        filings['folder_url'] = [base_url + accession.replace('-', '')
+                                 for accession in accession_numbers]
+        filings['file_url'] = [f"{folder}/{accession}.txt" for folder, accession in zip(
+            filings['folder_url'], accession_numbers)]
 
         return filings
 
-    def get_file_data(self, file_url: str) -> BeautifulSoup:
+    def get_file_data(self, file_url: str, parse_only: SoupStrainer = None) -> BeautifulSoup:
         """Get file data from file url which can be retrieved by calling self.get_file_url method.
 
         Args:
             file_url (str): File url to retrieve data from on the SEC website
+            parse_only (SoupStrainer, optional): restrict parsing to matching
+                tags, e.g. XBRL_INSTANCE_STRAINER for .txt instance documents
 
         Returns:
             data: File data as a BeautifulSoup object
@@ -505,7 +635,7 @@ class TickerData(SECData):
         data = self.rate_limited_request(
             url=file_url, headers=self.sec_headers)
         try:
-            soup = BeautifulSoup(data.content, "lxml")
+            soup = BeautifulSoup(data.content, "lxml", parse_only=parse_only)
             self.scrape_logger.info(
                 f'Parsed file data from {file_url} successfully.')
             return soup
@@ -518,18 +648,29 @@ class TickerData(SECData):
 
     # TODO: replace search_xxx methods with strategy pattern
 
-    def get_elements(self, folder_url: str, index_df: pd.DataFrame, scrape_file_extension: str) -> pd.DataFrame:
+    def get_elements(self, folder_url: str, index_df: pd.DataFrame, scrape_file_extension: str, xlink_type: str = None) -> pd.DataFrame:
         """Get elements from .xml files from folder_url.
 
         Args:
             folder_url (str): folder url to retrieve data from
             index_df (pd.DataFrame): dataframe containing files in the filing folder
             scrape_file_extension (str): .xml file extension to scrape
+            xlink_type (str, optional): keep only elements with this
+                xlink:type ('resource', 'arc', ...), filtered at parse time
+                so discarded rows never reach pandas
 
         Returns:
             pd.DataFrame: returns a dataframe containing the elements, attributes, text
         """
-        xml = index_df.query(f"name.str.contains('{scrape_file_extension}')")
+        cache_key = (folder_url, scrape_file_extension, xlink_type)
+        cached = self._elements_cache.get(cache_key)
+        if cached is not None:
+            return cached.copy()
+
+        # plain substring test - no need to interpolate into a query
+        # expression and regex-match every file name
+        xml = index_df.loc[index_df['name'].str.contains(
+            scrape_file_extension, regex=False)]
         xml_content = self.rate_limited_request(
             folder_url + '/' + xml['name'].iloc[0], headers=self.sec_headers).content
 
@@ -537,21 +678,27 @@ class TickerData(SECData):
         labels = xml_soup.find_all()
         labels_list = []
         for i in labels[1:]:
+            if xlink_type is not None and i.attrs.get('xlink:type') != xlink_type:
+                continue
             label_dict = dict(**i.attrs, labelText=i.text.strip())
             labels_list.append(label_dict)
-        return pd.DataFrame(labels_list)
+        df = pd.DataFrame(labels_list)
+        self._elements_cache[cache_key] = df
+        return df.copy()
 
-    def search_tags(self, soup: BeautifulSoup, pattern: str) -> BeautifulSoup:
+    def search_tags(self, soup: BeautifulSoup, pattern) -> BeautifulSoup:
         """Search for tags in BeautifulSoup object.
 
         Args:
             soup (BeautifulSoup): BeautifulSoup object
-            pattern (str): regex pattern to search for
+            pattern (str | re.Pattern): regex pattern to search for
 
         Returns:
             soup: BeautifulSoup object
         """
-        return soup.find_all(re.compile(pattern))
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+        return soup.find_all(pattern)
 
     def search_context(self, soup: BeautifulSoup) -> pd.DataFrame:
         """Search for context in company .txt filing. 
@@ -571,26 +718,41 @@ class TickerData(SECData):
                 'instant': 'datetime64[ns]'
             }
         """
-        contexts = self.search_tags(soup, '^context$')
-        dict_list = []
-        columns = {'contextId': str, 'entity': str, 'segment': str,
-                   'startDate': 'datetime64[ns]', 'endDate': 'datetime64[ns]', 'instant': 'datetime64[ns]'}
+        # exact tag name - bs4 matches it with a string compare instead of
+        # running a regex against every tag in the tree
+        contexts = soup.find_all('context')
+        columns = ['contextId', 'entity', 'segment',
+                   'startDate', 'endDate', 'instant']
+        date_columns = ['startDate', 'endDate', 'instant']
+        records = []
         for tag in contexts:
-            temp_dict = {}
-            temp_dict['contextId'] = tag.attrs.get('id')
-            temp_dict['entity'] = tag.find("entity").text.split()[
-                0] if tag.find("entity") is not None else None
-            temp_dict['segment'] = tag.find("segment").text.strip(
-            ) if tag.find("segment") is not None else None
-            temp_dict['startDate'] = tag.find("startdate").text if tag.find(
-                "startdate") is not None else None
-            temp_dict['endDate'] = tag.find("enddate").text if tag.find(
-                "enddate") is not None else None
-            temp_dict['instant'] = tag.find("instant").text if tag.find(
-                "instant") is not None else None
-            dict_list.append(temp_dict)
-
-        df = pd.DataFrame(dict_list, columns=columns.keys()).astype(columns)
+            # one walk over the subtree picks up all five child tags - five
+            # separate find calls re-traverse the same descendants each time
+            entity = segment = start_date = end_date = instant = None
+            for child in tag.descendants:
+                name = child.name
+                if name is None:
+                    continue
+                elif name == 'entity' and entity is None:
+                    entity = child.text.split()[0]
+                elif name == 'segment' and segment is None:
+                    segment = child.text.strip()
+                elif name == 'startdate' and start_date is None:
+                    start_date = child.text
+                elif name == 'enddate' and end_date is None:
+                    end_date = child.text
+                elif name == 'instant' and instant is None:
+                    instant = child.text
+            records.append((tag.attrs.get('id'), entity,
+                            segment, start_date, end_date, instant))
+
+        df = pd.DataFrame.from_records(records, columns=columns)
+        # contexts without an entity/segment used to surface as the string
+        # 'None' via the old astype(str) - downstream filters and pivots
+        # key on that label, so keep it rather than leaving NaN
+        df[['entity', 'segment']] = df[['entity', 'segment']].fillna('None')
+        df[date_columns] = df[date_columns].apply(
+            pd.to_datetime, format='%Y-%m-%d', errors='coerce', cache=True)
         return df
 
     def search_linklabels(self, soup: BeautifulSoup) -> pd.DataFrame:
@@ -612,23 +774,23 @@ class TickerData(SECData):
                 'label': str
             }
         """
-        links = self.search_tags(soup, '^link:label$')
-        dict_list = []
+        links = soup.find_all('link:label')
         columns = {'linkLabelId': str, 'xlinkLabel': str, 'xlinkRole': str,
                    'xlinkType': str, 'xlmnsXml': str, 'xmlLang': str, 'label': str}
-
+        # one list per column - pandas builds each column directly instead
+        # of pivoting a list of per-row dicts
+        data = {name: [] for name in columns}
         for tag in links:
-            temp_dict = {}
-            temp_dict['linkLabelId'] = tag.attrs.get('id')
-            temp_dict['xlinkLabel'] = tag.attrs.get('xlink:label')
-            temp_dict['xlinkRole'] = tag.attrs.get('xlink:role')
-            temp_dict['xlinkType'] = tag.attrs.get('xlink:type')
-            temp_dict['xlmnsXml'] = tag.attrs.get('xmlns:xml')
-            temp_dict['xmlLang'] = tag.attrs.get('xml:lang')
-            temp_dict['label'] = tag.text if tag.text is not None else None
-            dict_list.append(temp_dict)
-
-        df = pd.DataFrame(dict_list, columns=columns.keys()).astype(columns)
+            attrs = tag.attrs
+            data['linkLabelId'].append(attrs.get('id'))
+            data['xlinkLabel'].append(attrs.get('xlink:label'))
+            data['xlinkRole'].append(attrs.get('xlink:role'))
+            data['xlinkType'].append(attrs.get('xlink:type'))
+            data['xlmnsXml'].append(attrs.get('xmlns:xml'))
+            data['xmlLang'].append(attrs.get('xml:lang'))
+            data['label'].append(tag.text)
+
+        df = pd.DataFrame(data).astype(columns)
         return df
 
     def search_facts(self, soup: BeautifulSoup) -> pd.DataFrame:
@@ -649,22 +811,19 @@ class TickerData(SECData):
                 'value': str
             }
         """
-        facts = self.search_tags(soup, '^us-gaap:')
-        dict_list = []
-        columns = {'factName': str, 'contextRef': str, 'decimals': int, 'factId': str,
-                   'unitRef': str, 'value': str}
-
+        facts = self.search_tags(soup, _FACT_TAG_RE)
+        data = {'factName': [], 'contextRef': [], 'decimals': [], 'factId': [],
+                'unitRef': [], 'value': []}
         for tag in facts:
-            temp_dict = {}
-            temp_dict['factName'] = tag.name
-            temp_dict['contextRef'] = tag.attrs.get('contextref')
-            temp_dict['decimals'] = tag.attrs.get('decimals')
-            temp_dict['factId'] = tag.attrs.get('id')
-            temp_dict['unitRef'] = tag.attrs.get('unitref')
-            temp_dict['value'] = tag.text
-            dict_list.append(temp_dict)
-
-        df = pd.DataFrame(dict_list, columns=columns.keys())
+            attrs = tag.attrs
+            data['factName'].append(tag.name)
+            data['contextRef'].append(attrs.get('contextref'))
+            data['decimals'].append(attrs.get('decimals'))
+            data['factId'].append(attrs.get('id'))
+            data['unitRef'].append(attrs.get('unitref'))
+            data['value'].append(tag.text)
+
+        df = pd.DataFrame(data)
         return df
 
     def get_metalinks(self, metalinks_url: str) -> pd.DataFrame:
@@ -683,25 +842,32 @@ class TickerData(SECData):
                 'documentation': str,
             }
         """
+        cached = self._metalinks_cache.get(metalinks_url)
+        if cached is not None:
+            return cached.copy()
+
         try:
             response = self.rate_limited_request(
                 url=metalinks_url, headers=self.sec_headers).json()
-            metalinks_instance = convert_keys_to_lowercase(
-                response['instance'])
-            instance_key = list(metalinks_instance.keys())[0]
+            # only the tag subtree is read below - normalising the whole
+            # instance would also walk the dts/report trees we discard
+            instance = response['instance']
+            instance_key = next(iter(instance))
+            tags = convert_keys_to_lowercase(instance[instance_key]['tag'])
             dict_list = []
-            for i in metalinks_instance[instance_key]['tag']:
-                dict_list.append(dict(labelKey=i.lower(),
-                                      localName=metalinks_instance[instance_key]['tag'][i].get(
-                                          'localname'),
-                                      labelName=metalinks_instance[instance_key]['tag'][i].get(
-                                          'lang').get('enus').get('role').get('label'),
-                                      terseLabel=metalinks_instance[instance_key]['tag'][i].get(
-                                          'lang').get('enus').get('role').get('terselabel'),
-                                      documentation=metalinks_instance[instance_key]['tag'][i].get('lang').get('enus').get('role').get('documentation'),))
+            # resolve each tag dict and its role dict once per tag - the
+            # old per-field chains redid the full lookup path five times
+            for label_key, tag in tags.items():
+                role = tag.get('lang').get('enus').get('role')
+                dict_list.append(dict(labelKey=label_key.lower(),
+                                      localName=tag.get('localname'),
+                                      labelName=role.get('label'),
+                                      terseLabel=role.get('terselabel'),
+                                      documentation=role.get('documentation'),))
 
             df = pd.DataFrame.from_dict(dict_list)
-            return df
+            self._metalinks_cache[metalinks_url] = df
+            return df.copy()
         except Exception as e:
             self.scrape_logger.error(
                 f'Failed to retrieve metalinks from {metalinks_url}. Error: {e}')
@@ -738,7 +904,8 @@ class TickerData(SECData):
         """
         columns_to_keep = ['factName', 'contextRef', 'decimals', 'factId', 'unitRef', 'value', 'segment', 'startDate',
                            'endDate', 'instant', 'accessionNumber']
-        soup = self.get_file_data(filing['file_url'])
+        soup = self.get_file_data(
+            filing['file_url'], parse_only=XBRL_INSTANCE_STRAINER)
         facts = self.search_facts(soup)
         context = self.search_context(soup)
         # metalinks = self.get_metalinks(
@@ -747,25 +914,37 @@ class TickerData(SECData):
         # if metalinks is None:
         #     return None
         context['segment'] = context['segment'].str.replace(
-            pat=r'[^a-zA-Z0-9]', repl='', regex=True).str.lower()
-        df = facts.merge(context, how='left',
+            pat=_NON_ALNUM_RE, repl='', regex=True).str.lower()
+        # merge only the context columns that survive columns_to_keep -
+        # anything else would be materialised in the output and dropped
+        context_cols = ['contextId', 'segment',
+                        'startDate', 'endDate', 'instant']
+        df = facts.merge(context[context_cols], how='left',
                          left_on='contextRef', right_on='contextId')
         # .merge(metalinks, how='left', left_on='segment', right_on='labelKey')
 
-        df['ticker'] = self.ticker
-        df['cik'] = self.cik
+        # ticker/cik are not in columns_to_keep, so stamping them onto every
+        # row only to drop them below was wasted allocation; accessionNumber
+        # broadcasts one shared string per row
         df['accessionNumber'] = filing['accessionNumber']
 
-        df = df.loc[~df['unitRef'].isnull(), columns_to_keep].replace({
-            pd.NaT: None})
+        df = df.loc[~df['unitRef'].isnull(), columns_to_keep]
+        # only the datetime columns can hold NaT - replace({pd.NaT: None})
+        # would compare every cell of every column
+        dt_cols = df.select_dtypes(include=['datetime64[ns]']).columns
+        df[dt_cols] = df[dt_cols].astype(object).where(
+            df[dt_cols].notna(), None)
 
-        return facts, context, df.to_dict('records')
+        # itertuples streams typed rows without to_dict's per-column boxing
+        # loop over the whole frame
+        cols = df.columns.tolist()
+        records = [dict(zip(cols, row))
+                   for row in df.itertuples(index=False, name=None)]
+
+        return facts, context, records
 
     def __repr__(self) -> str:
         class_name = type(self).__name__
-        main_attrs = ['ticker', 'cik', 'submissions', 'filings']
-        available_methods = [method_name for method_name in dir(self) if callable(
-            getattr(self, method_name)) and not method_name.startswith("_")]
         return f"""{class_name}({self.ticker})
     CIK: {self.cik}
     Latest filing: {self.latest_filing['filingDate'].strftime('%Y-%m-%d') if self.latest_filing else 'No filing found'} for Form {self.latest_filing['form'] if self.latest_filing else None}. Access via: {self.latest_filing['folder_url'] if self.latest_filing else None}
@@ -773,10 +952,6 @@ class TickerData(SECData):
     Latest 10-K: {self.latest_10K['filingDate'].strftime('%Y-%m-%d') if self.latest_10K else 'No filing found'}. Access via: {self.latest_10K['folder_url'] if self.latest_10K else None}"""
 
     def __repr_html__(self) -> str:
-        class_name = type(self).__name__
-        main_attrs = ['ticker', 'cik', 'submissions', 'filings']
-        available_methods = [method_name for method_name in dir(self) if callable(
-            getattr(self, method_name)) and not method_name.startswith("_")]
         latest_filing_date = self.latest_filing['filingDate'].strftime(
             '%Y-%m-%d') if self.latest_filing else 'No filing found'
         latest_filing_form = self.latest_filing['form'] if self.latest_filing else None
@@ -804,46 +979,80 @@ if __name__ == "__main__":
     sec = SECData(requester_company='Financial Docs', requester_name='John Doe',
                   requester_email='financialdocs@gmail.com', taxonomy='us-gaap')
 
+    # pass --parquet to export typed, compressed parquet (via pyarrow)
+    # instead of CSV - smaller files and a far faster round-trip
+    use_parquet = '--parquet' in sys.argv[1:]
+
+    def save_companyfacts(companyfacts: pd.DataFrame, ticker: str) -> str:
+        if use_parquet:
+            file_name = f"data/{ticker}.parquet"
+            companyfacts.to_parquet(
+                file_name, compression='zstd', index=False)
+        else:
+            file_name = f"data/{ticker}.csv"
+            # write in chunks so the formatted text is flushed as it is
+            # built instead of materialising the whole file in memory
+            companyfacts.to_csv(file_name, index=False, chunksize=10000)
+        print(f"Data saved to {file_name}")
+        return file_name
+
+    # precompute the lower-cased titles once so every search is a single
+    # vectorized substring scan
+    title_lower = sec.cik_list['title'].str.lower()
+
     # Get user input
     while True:
         choice = input(
             """
 Choose one of the following options:
-- Enter a ticker symbol to get all facts in SEC database
+- Enter a ticker symbol (or a comma-separated list) to get all facts in SEC database
 - Enter a company name to search for ticker symbols
 - 'list' to list all tickers
 - 'exit' to exit
 
 Your input: """)
 
-        if choice in sec.cik['ticker'].values:
+        if choice in sec.ticker_cik_map:
             companyfacts = sec.get_data_as_dataframe(
                 sec.get_ticker_cik(choice))
-            file_name = f"data/{choice}.csv"
-            companyfacts.to_csv(file_name, index=False)
+            file_name = save_companyfacts(companyfacts, choice)
             choice_data = TickerData(ticker=choice)
             choice_data.scrape_logger.info(f"Data saved to {file_name}")
-            print(f"Data saved to {file_name}")
+            print('---------------------------------------')
+
+        elif ',' in choice and all(t.strip() in sec.ticker_cik_map for t in choice.split(',')):
+            # overlap the fetches across threads - the downloads share the
+            # pooled session and rate_limited_request keeps them inside the
+            # SEC request budget
+            tickers = [t.strip() for t in choice.split(',')]
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                fetched = executor.map(
+                    lambda ticker: sec.get_data_as_dataframe(
+                        sec.get_ticker_cik(ticker)), tickers)
+                for ticker, companyfacts in zip(tickers, fetched):
+                    save_companyfacts(companyfacts, ticker)
             print('---------------------------------------')
 
         elif choice == 'exit':
             exit()
         elif choice == 'list':
-            for row in sec.cik.iterrows():
-                print(row[1]['ticker'], row[1]['title'])
+            # one vectorized concat and one write instead of a Series
+            # allocation and print call per row
+            print('\n'.join(sec.cik_list['ticker'] +
+                  ' ' + sec.cik_list['title']))
             print('---------------------------------------')
 
         elif choice.isalpha():
-            search_results = sec.cik.loc[sec.cik['title'].str.lower().str.contains(
-                choice)]
+            search_results = sec.cik_list.loc[title_lower.str.contains(
+                choice.lower(), regex=False, na=False)]
             if len(search_results) == 0:
                 print("No results found.")
                 print('---------------------------------------')
             else:
                 print(f"Found {len(search_results)} results:")
                 print('---------------------------------------')
-                for row in search_results.iterrows():
-                    print(f"{row[1]['ticker']}: {row[1]['title']}")
+                print('\n'.join(search_results['ticker'] +
+                      ': ' + search_results['title']))
                 print('---------------------------------------')
 
         else: